@@ -8,16 +8,73 @@ A tool that crawls websites, extracts images, and can follow links to a specifie
 import os
 import re
 import time
+import shutil
 import random
+import hashlib
 import argparse
+import json
 import urllib.parse
+import threading
+import functools
+import itertools
 import cloudscraper
 from urllib.parse import urlparse, urljoin
-from concurrent.futures import ThreadPoolExecutor
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+import asyncio
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer, Tag
 import logging
 
+# Advertise only the compressions the installed urllib3 stack can actually
+# decode - zstd, for example, needs urllib3>=2 with zstandard; claiming more
+# would hand response.text an undecoded binary body
+try:
+    from urllib3.util.request import ACCEPT_ENCODING as _ACCEPT_ENCODING
+except ImportError:
+    _ACCEPT_ENCODING = 'gzip, deflate'
+
+# The pure per-URL string helpers live in _fastpath, annotated and free of
+# class state so they can be compiled with mypyc/Cython if a build step is
+# ever added
+from _fastpath import (IMAGE_EXTS as _IMAGE_EXTS,
+                       likely_image_url as _likely_image_url,
+                       ext_from_url as _ext_from_url,
+                       ext_from_mime as _ext_from_mime,
+                       netloc as _netloc)
+
+# aiohttp runs all image downloads on one event loop with a shared connection
+# pool; without it installed the threaded downloader is used instead
+try:
+    import aiohttp
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
+# lxml parses in C and is the parser we ship with, but fall back to the
+# stdlib parser rather than crash if it's missing
+try:
+    import lxml  # noqa: F401
+    _BS4_PARSER = 'lxml'
+except ImportError:
+    _BS4_PARSER = 'html.parser'
+
+# orjson parses JSON payloads 2-3x faster than the stdlib; used for the
+# embedded JSON blobs SPA frameworks ship inside script tags
+try:
+    import orjson as _json
+except ImportError:
+    _json = json
+
+# selectolax's Lexbor engine hands back lightweight C-backed node handles,
+# another order of magnitude faster than BeautifulSoup for the per-page
+# extraction queries; bs4 remains the fallback when it's not installed
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    HAS_SELECTOLAX = True
+except ImportError:
+    HAS_SELECTOLAX = False
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -25,13 +82,123 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Precompiled patterns for the per-page hot paths - these run once per <style>
+# tag / styled element / download, so compile them a single time at import
+_CSS_URL_RE = re.compile(r'url\([\'"]?([^\'"()]+)[\'"]?\)')
+_FN_RE = re.compile(r'filename=[\'"]?([^\'";]+)')
+# Image URLs quoted inside JavaScript/JSON; this also covers the
+# contentstack.io pattern (Smith & Wesson site), which is a strict subset
+_JS_IMG_RE = re.compile(r'"(https?://[^"]*\.(?:jpg|jpeg|png|gif))"')
+# JSON state blocks embedded by SPA frameworks (__NEXT_DATA__, ld+json, ...)
+_JSON_SCRIPT_RE = re.compile(
+    r'<script[^>]*type=["\']application/(?:ld\+)?json["\'][^>]*>(.*?)</script>',
+    re.DOTALL | re.IGNORECASE)
+# The backreference keeps the capture running to the matching delimiter, so
+# the opposite quote style inside the value (url('x.gif') in a double-quoted
+# attribute) doesn't truncate it
+_STYLE_ATTR_RE = re.compile(r'style=(["\'])(.*?)\1')
+# First token of each srcset entry ("url 1x, url 2x" / "url 100w, ..."),
+# captured without the split(',')/split(' ') intermediate lists
+_SRCSET_URL_RE = re.compile(r'([^\s,]+)(?:\s+[^,]*)?')
+
+# Filename characters that are invalid on common filesystems, mapped to '_'
+# in a single translate() pass instead of one replace() per character
+_SANITIZE_TABLE = str.maketrans({c: '_' for c in '<>:"/\\|?*'})
+
+# Only these tags are ever consumed by the extractors; restricting the parse
+# to them keeps BeautifulSoup from building nodes for script/table/svg
+# content that would just be discarded
+_PARSE_TAGS = SoupStrainer(['img', 'picture', 'source', 'style', 'a', 'meta'])
+
+# Rotation pool for the occasional User-Agent change in _fetch_url
+_USER_AGENTS = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.1.1 Safari/605.1.15',
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/92.0.4515.107 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:90.0) Gecko/20100101 Firefox/90.0',
+)
+
+# Domains known to sit behind Cloudflare; endswith also matches subdomains
+_CLOUDFLARE_DOMAINS = ('imfdb.org', 'wikia.com', 'fandom.com')
+
+# Downloads larger than this are abandoned from the Content-Length header
+# alone, before any of the body is read
+_MAX_IMAGE_BYTES = 50 * 1024 * 1024
+
+# Buffer size for streaming image bodies to disk - large enough that the
+# loop overhead per byte is negligible, small enough not to hog memory
+# across concurrent downloads
+_DOWNLOAD_CHUNK = 1024 * 1024
+
+# Cap on the exponential retry backoff for downloads
+_MAX_BACKOFF = 30
+
+
+def _retry_backoff(attempt):
+    """Full-jitter backoff delay for a retry attempt
+
+    Sleeping random.uniform(0, 2**attempt) instead of exactly 2**attempt
+    spreads the retries of many concurrent workers out, so a server hiccup
+    doesn't produce a synchronized thundering herd of retries.
+
+    Args:
+        attempt (int): Zero-based attempt number
+
+    Returns:
+        float: Seconds to sleep before the next attempt
+    """
+    return random.uniform(0, min(_MAX_BACKOFF, 2 ** attempt))
+
+
+def _is_transient_status(status):
+    """Whether an HTTP status code is worth retrying
+
+    Args:
+        status (int): HTTP status code
+
+    Returns:
+        bool: True for 429 and 5xx; 4xx errors won't change on retry
+    """
+    return status == 429 or status >= 500
+
+# Attributes used by common lazy-loading schemes
+_LAZY_ATTRS = ('data-src', 'data-original', 'data-lazy-src', 'data-srcset', 'lazy-src')
+
+
+@functools.lru_cache(maxsize=1024)
+def _sanitize_core(filename):
+    """Deterministic part of filename sanitization, memoized
+
+    CDN-served images repeat the same filenames constantly (logo.png,
+    thumb.jpg, ...), so the translate/truncate/strip work is cached per
+    distinct name. The non-deterministic empty-name fallback stays in
+    _sanitize_filename, outside the cache.
+
+    Args:
+        filename (str): Filename to sanitize
+
+    Returns:
+        str: Sanitized filename, possibly empty
+    """
+    # Replace potentially problematic characters
+    filename = filename.translate(_SANITIZE_TABLE)
+
+    # Limit filename length to avoid issues with long paths
+    if len(filename) > 150:
+        name, ext = os.path.splitext(filename)
+        filename = name[:140] + ext
+
+    # Remove leading/trailing spaces and dots which can cause issues
+    return filename.strip('. ')
+
 class WebsiteImageCrawler:
     """Crawler that extracts images from websites and can follow links to a specified depth"""
     
-    def __init__(self, save_dir="./crawled_images", max_images=100, formats=None, 
-                 delay=1, user_agent=None, max_retries=3, verbose=False):
+    def __init__(self, save_dir="./crawled_images", max_images=100, formats=None,
+                 delay=1, user_agent=None, max_retries=3, verbose=False, workers=10,
+                 use_async=None, resume=False):
         """Initialize the crawler with configuration parameters
-        
+
         Args:
             save_dir (str): Directory to save downloaded images
             max_images (int): Maximum number of images to download
@@ -40,6 +207,11 @@ class WebsiteImageCrawler:
             user_agent (str): Custom user agent string
             max_retries (int): Maximum number of retry attempts for failed requests
             verbose (bool): Enable verbose output
+            workers (int): Number of concurrent image downloads
+            use_async (bool): Download via the aiohttp event loop; defaults
+                to True whenever aiohttp is installed
+            resume (bool): Preload visited/image URL sets from the discovery
+                logs of a previous run in the same save_dir
         """
         self.save_dir = save_dir
         self.max_images = max_images
@@ -47,6 +219,8 @@ class WebsiteImageCrawler:
         self.delay = delay
         self.max_retries = max_retries
         self.verbose = verbose
+        self.workers = workers
+        self.use_async = HAS_AIOHTTP if use_async is None else (use_async and HAS_AIOHTTP)
         
         # Use browser-like headers to avoid being blocked by anti-scraping measures
         self.headers = {
@@ -67,6 +241,13 @@ class WebsiteImageCrawler:
         # Create a requests session for connection pooling
         self.session = requests.Session()
         self.session.headers.update(self.headers)
+
+        # Default adapters cap the urllib3 pool at 10; size it well above the
+        # download worker count so concurrent requests to one host keep
+        # reusing persistent connections instead of re-doing TCP+TLS setup
+        adapter = requests.adapters.HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         
         # Create a cloudscraper session for bypassing Cloudflare protection
         self.cloudscraper_session = cloudscraper.create_scraper()
@@ -87,7 +268,7 @@ class WebsiteImageCrawler:
             "User-Agent": self.user_agent,
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
             "Accept-Language": "en-US,en;q=0.5",
-            "Accept-Encoding": "gzip, deflate, br",
+            "Accept-Encoding": _ACCEPT_ENCODING,
             "Connection": "keep-alive",
             "Upgrade-Insecure-Requests": "1",
             "Cache-Control": "max-age=0"
@@ -99,8 +280,71 @@ class WebsiteImageCrawler:
         # Initialize tracking variables
         self.visited_urls = set()
         self.image_urls = set()
-        self.pages_by_depth = {}
+        self._queue = deque()
         self.downloaded_images = []
+
+        # One-slot semaphore per host so concurrent page fetches stay polite
+        # towards each individual site while different hosts overlap freely,
+        # plus the time each host was last hit so the delay only covers
+        # whatever gap is actually left
+        self._host_semaphores = defaultdict(lambda: threading.Semaphore(1))
+        self._host_last = {}
+
+        # Guards visited_urls/image_urls: the crawl loop mutates them while
+        # fetch workers read visited_urls for referer selection
+        self._state_lock = threading.Lock()
+
+        # Visited URLs bucketed by host so _fetch_url can pick a same-domain
+        # referer with one dict lookup instead of scanning every visited URL
+        self._visited_by_domain = defaultdict(list)
+
+        # Digests of page bodies already processed; pagination and session
+        # variants often serve byte-identical HTML that isn't worth re-parsing
+        self._seen_digests = set()
+
+        # On-disk page cache keyed by URL digest. Re-runs send conditional
+        # requests (If-None-Match/If-Modified-Since) and a 304 serves the
+        # body from disk, skipping the transfer entirely
+        self._page_cache_dir = os.path.join(self.save_dir, '.pagecache')
+        os.makedirs(self._page_cache_dir, exist_ok=True)
+
+        # Append-only discovery logs. URLs are streamed out as they are
+        # found, so a crashed or interrupted crawl leaves a usable record;
+        # resume=True preloads the sets from them so only unseen pages and
+        # images are processed on the next run
+        self._visited_log_path = os.path.join(self.save_dir, 'visited.log')
+        self._images_log_path = os.path.join(self.save_dir, 'images.log')
+        if resume:
+            for url in self._load_log(self._visited_log_path):
+                self.visited_urls.add(url)
+                self._visited_by_domain[_netloc(url)].append(url)
+            self.image_urls |= self._load_log(self._images_log_path)
+            if self.visited_urls or self.image_urls:
+                logger.info(f"Resuming with {len(self.visited_urls)} visited URLs "
+                            f"and {len(self.image_urls)} known images")
+        self._open_logs()
+
+        # Manifest of downloaded images keyed by URL, with the saved path
+        # and the server's validators. Re-runs turn already-downloaded
+        # images into conditional GETs answered by a bodyless 304
+        self._manifest_path = os.path.join(self.save_dir, 'manifest.json')
+        self._manifest_lock = threading.Lock()
+        try:
+            with open(self._manifest_path) as f:
+                self._manifest = json.load(f)
+        except (OSError, ValueError):
+            self._manifest = {}
+
+        # Long-lived pool for the threaded download fallback; creating an
+        # executor per batch paid thread startup/teardown over and over
+        self._download_pool = ThreadPoolExecutor(max_workers=self.workers)
+
+        # Background event loop and aiohttp session shared by all download
+        # batches, started lazily - keeping them alive lets one connector's
+        # keep-alive pool and DNS cache span the whole crawl instead of
+        # being torn down by asyncio.run after every page
+        self._async_loop = None
+        self._aio_session = None
         
     def crawl(self, start_url, depth=1):
         """Crawl a website starting from the given URL up to the specified depth
@@ -117,142 +361,200 @@ class WebsiteImageCrawler:
         # Make sure the URL is properly formatted
         if not start_url.startswith(('http://', 'https://')):
             start_url = 'https://' + start_url
-            
-        # Track the pages at each depth
-        self.pages_by_depth = {0: [start_url]}
-        self.visited_urls.add(start_url)
-        
-        # Process each depth level
-        for current_depth in range(depth + 1):
-            logger.info(f"Processing depth {current_depth}")
-            
-            # Get pages for the current depth
-            current_pages = self.pages_by_depth.get(current_depth, [])
-            
-            if not current_pages:
-                logger.info(f"No pages to process at depth {current_depth}")
-                break
-                
-            # Initialize the next depth's pages
-            if current_depth < depth:
-                self.pages_by_depth[current_depth + 1] = []
-            
-            # Process each page at the current depth
-            for page_url in current_pages:
-                logger.info(f"Processing page: {page_url}")
-                
-                # Extract images and links from the page
-                html_content = self._fetch_url(page_url)
-                if not html_content:
-                    continue
-                
-                # Extract images from the page
-                page_images = self._extract_images(html_content, page_url)
-                new_images = [img for img in page_images if img not in self.image_urls]
-                self.image_urls.update(page_images)
-                logger.info(f"Found {len(page_images)} images on {page_url} ({len(new_images)} new)")
-                
-                # Download the new images immediately (up to max_images limit)
-                if new_images and len(self.downloaded_images) < self.max_images:
-                    # Calculate how many more images we can download
-                    remaining = self.max_images - len(self.downloaded_images)
-                    # Take only what we need to reach the max
-                    images_to_download = new_images[:remaining]
-                    logger.info(f"Downloading {len(images_to_download)} images from {page_url}...")
-                    
-                    # Download the images
-                    new_downloads = self.download_images(images_to_download, self.formats)
-                    self.downloaded_images.extend(new_downloads)
-                    
-                    # Check if we've reached our limit
-                    if len(self.downloaded_images) >= self.max_images:
-                        logger.info(f"Reached maximum of {self.max_images} images. Stopping downloads.")
-                
-                # Extract links if we haven't reached maximum depth
-                if current_depth < depth:
-                    links = self._extract_links(html_content, page_url)
-                    new_links = [link for link in links if link not in self.visited_urls]
-                    
-                    # Add to next depth and mark as visited
-                    self.pages_by_depth[current_depth + 1].extend(new_links)
-                    self.visited_urls.update(new_links)
-                    
-                    logger.info(f"Found {len(new_links)} new links on {page_url}")
-                
-                # Respect the site by waiting between requests
-                time.sleep(self.delay)
-                
-                # Stop crawling if we've reached our image limit
-                if len(self.downloaded_images) >= self.max_images:
-                    logger.info(f"Reached maximum of {self.max_images} images. Stopping crawl.")
-                    return {
-                        'downloaded_images': self.downloaded_images,
-                        'visited_pages': list(self.visited_urls),
-                        'total_images_found': len(self.image_urls)
-                    }
-        
-        return {
-            'downloaded_images': self.downloaded_images,
-            'visited_pages': list(self.visited_urls),
-            'total_images_found': len(self.image_urls)
-        }
-    
+
+        # close() ran at the end of any previous crawl on this instance;
+        # reopen the discovery logs it released (the event loop and aiohttp
+        # session recreate themselves lazily on first use)
+        if self._visited_log.closed:
+            self._open_logs()
+
+
+        # Single BFS work queue of (url, depth) pairs - discovered links are
+        # queued the moment their page is processed, so the fetch pool stays
+        # full across depth boundaries instead of draining at each level
+        self._queue = deque([(start_url, 0)])
+        if start_url not in self.visited_urls:
+            self.visited_urls.add(start_url)
+            self._visited_by_domain[_netloc(start_url)].append(start_url)
+            self._visited_log.write(start_url + '\n')
+
+        try:
+            # Fetch pages concurrently - pages are independent, so a serial
+            # fetch+sleep loop only wasted time. Extraction and downloads
+            # stay on the main thread.
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                pending = {}
+                while self._queue or pending:
+                    # Keep a couple of fetches in flight per worker
+                    while self._queue and len(pending) < 16:
+                        url, d = self._queue.popleft()
+                        pending[executor.submit(self._fetch_polite, url)] = (url, d)
+
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        page_url, d = pending.pop(future)
+                        try:
+                            html_content = future.result()
+                        except Exception as e:
+                            logger.error(f"Error fetching {page_url}: {e}")
+                            continue
+                        if not html_content:
+                            continue
+
+                        logger.info(f"Processing page: {page_url} (depth {d})")
+                        self._process_page(html_content, page_url, d, depth)
+
+                        # Stop crawling if we've reached our image limit
+                        if len(self.downloaded_images) >= self.max_images:
+                            logger.info(f"Reached maximum of {self.max_images} images. Stopping crawl.")
+                            executor.shutdown(wait=False, cancel_futures=True)
+                            return {
+                                'downloaded_images': self.downloaded_images,
+                                'visited_pages': list(self.visited_urls),
+                                'total_images_found': len(self.image_urls)
+                            }
+
+            return {
+                'downloaded_images': self.downloaded_images,
+                'visited_pages': list(self.visited_urls),
+                'total_images_found': len(self.image_urls)
+            }
+        finally:
+            self.close()
+
+    def _fetch_polite(self, url):
+        """Fetch a page while rate-limiting per host
+
+        Each host gets its own one-slot semaphore and last-request
+        timestamp, so requests to one site stay self.delay apart while
+        fetches to other hosts proceed in parallel. Sleeping only the
+        remaining gap (rather than a flat delay after every fetch) means
+        time spent fetching or processing other pages counts towards the
+        spacing.
+        """
+        host = _netloc(url)
+        with self._host_semaphores[host]:
+            wait = self.delay - (time.monotonic() - self._host_last.get(host, 0.0))
+            if wait > 0:
+                time.sleep(wait)
+            html_content = self._fetch_url(url)
+            self._host_last[host] = time.monotonic()
+        return html_content
+
+    def _process_page(self, html_content, page_url, current_depth, depth):
+        """Extract images and links from a fetched page and download new images"""
+        # Parse the HTML once; image and link extraction share the tree
+        soup = self._parse_page(html_content)
+
+        # Extract images from the page
+        page_images = self._extract_images(soup, html_content, page_url)
+        with self._state_lock:
+            new_images = page_images - self.image_urls
+            self.image_urls |= page_images
+            if new_images:
+                self._images_log.write('\n'.join(new_images) + '\n')
+        logger.info(f"Found {len(page_images)} images on {page_url} ({len(new_images)} new)")
+
+        # Download the new images immediately (up to max_images limit)
+        if new_images and len(self.downloaded_images) < self.max_images:
+            # Calculate how many more images we can download
+            remaining = self.max_images - len(self.downloaded_images)
+            # Take only what we need to reach the max, without copying the set
+            images_to_download = list(itertools.islice(new_images, remaining))
+            logger.info(f"Downloading {len(images_to_download)} images from {page_url}...")
+
+            # Download the images
+            new_downloads = self.download_images(images_to_download, self.formats)
+            self.downloaded_images.extend(new_downloads)
+
+            # Check if we've reached our limit
+            if len(self.downloaded_images) >= self.max_images:
+                logger.info(f"Reached maximum of {self.max_images} images. Stopping downloads.")
+
+        # Extract links if we haven't reached maximum depth
+        if current_depth < depth:
+            links = self._extract_links(soup, page_url)
+            with self._state_lock:
+                # One C-level set difference instead of a per-link membership test
+                new_links = set(links) - self.visited_urls
+
+                # Queue for fetching and mark as visited
+                self.visited_urls |= new_links
+                for link in new_links:
+                    self._visited_by_domain[_netloc(link)].append(link)
+                    self._queue.append((link, current_depth + 1))
+                if new_links:
+                    self._visited_log.write('\n'.join(new_links) + '\n')
+
+            logger.info(f"Found {len(new_links)} new links on {page_url}")
+
+
     def _fetch_url(self, url):
-        
+
+        # Build per-request headers - the session is shared by concurrent
+        # fetch workers, so mutating session.headers here would race other
+        # threads' in-flight requests
+        req_headers = {}
+
         # Use a realistic referer if we're not on the first page
         if len(self.visited_urls) > 0:
             # Set referer to a previously visited page from the same domain
             parsed_url = urllib.parse.urlparse(url)
             domain = parsed_url.netloc
-            referers = [u for u in self.visited_urls if urllib.parse.urlparse(u).netloc == domain]
-            if referers:
-                self.session.headers.update({'Referer': random.choice(referers)})
-            else:
-                # Default to the site's homepage as referer
-                homepage = f"{parsed_url.scheme}://{parsed_url.netloc}/"
-                self.session.headers.update({'Referer': homepage})
-        
+            with self._state_lock:
+                referers = self._visited_by_domain.get(domain)
+                referer = random.choice(referers) if referers else None
+            # Default to the site's homepage as referer
+            req_headers['Referer'] = referer or f"{parsed_url.scheme}://{domain}/"
+
         for attempt in range(1, self.max_retries + 1):
             try:
                 # Slightly randomize the user agent occasionally to appear more human-like
                 if random.random() < 0.2:  # 20% chance to change user agent
-                    self.session.headers.update({
-                        'User-Agent': random.choice([
-                            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.1.1 Safari/605.1.15',
-                            'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/92.0.4515.107 Safari/537.36',
-                            'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:90.0) Gecko/20100101 Firefox/90.0'
-                        ])
-                    })
-                
+                    req_headers['User-Agent'] = _USER_AGENTS[random.randrange(len(_USER_AGENTS))]
+
                 # Make the request with cookie handling enabled
                 # Try with cloudscraper first for known Cloudflare-protected domains
                 parsed_url = urllib.parse.urlparse(url)
                 domain = parsed_url.netloc
                 
-                # List of known domains that use Cloudflare protection
-                cloudflare_domains = ['imfdb.org', 'wikia.com', 'fandom.com']
-                
-                if any(cf_domain in domain for cf_domain in cloudflare_domains):
+                # Known domains that use Cloudflare protection - one C-level
+                # suffix check instead of a per-attempt list build and scan
+                if domain.endswith(_CLOUDFLARE_DOMAINS):
                     logger.info(f"Using cloudscraper for known Cloudflare-protected domain: {domain}")
                     try:
                         scraper_response = self.cloudscraper_session.get(url, timeout=30)
                         scraper_response.raise_for_status()
-                        return scraper_response.text
+                        return self._dedupe_content(scraper_response)
                     except Exception as cf_error:
                         logger.warning(f"Cloudscraper failed for {url}: {cf_error}, falling back to regular requests")
                         # Fall through to regular requests as a backup
                 
                 # Regular request handling
                 try:
-                    response = self.session.get(url, timeout=15, allow_redirects=True)
+                    conditional = self._cached_page_headers(url)
+                    response = self.session.get(url, timeout=15, allow_redirects=True,
+                                                headers={**req_headers, **conditional})
+                    if response.status_code == 304:
+                        cached = self._read_cached_page(url)
+                        if cached is not None:
+                            logger.info(f"Not modified - serving {url} from page cache")
+                            return cached
+                        # The cached body went missing; refetch unconditionally
+                        response = self.session.get(url, timeout=15, allow_redirects=True,
+                                                    headers=req_headers)
                     response.raise_for_status()
-                    
+
                     # If we got here, save any cookies the site set
                     if len(response.cookies) > 0:
-                        logger.debug(f"Received cookies from {url}: {dict(response.cookies)}")
-                    
-                    return response.text
+                        logger.debug("Received cookies from %s: %s", url, dict(response.cookies))
+
+                    # Visibility into which compression the server negotiated
+                    logger.debug("Content-Encoding for %s: %s", url,
+                                 response.headers.get('Content-Encoding', 'identity'))
+
+                    self._store_cached_page(url, response)
+                    return self._dedupe_content(response)
                 except requests.exceptions.HTTPError as e:
                     # If we get a 403 Forbidden, try cloudscraper as a fallback
                     if e.response.status_code == 403:
@@ -262,7 +564,7 @@ class WebsiteImageCrawler:
                             scraper_response = self.cloudscraper_session.get(url, timeout=30)
                             scraper_response.raise_for_status()
                             logger.info(f"Successfully bypassed protection for {url} using cloudscraper")
-                            return scraper_response.text
+                            return self._dedupe_content(scraper_response)
                         except Exception as scraper_error:
                             logger.error(f"Failed to bypass protection: {scraper_error}")
                             raise e
@@ -279,47 +581,208 @@ class WebsiteImageCrawler:
                     logger.error(f"Failed to fetch {url} after {self.max_retries} attempts")
                     return None
     
+    def _dedupe_content(self, response):
+        """Return a response's text, or None if we already processed that body
+
+        BLAKE2b hashes HTML at multi-GB/s, so the digest is effectively free
+        compared to the parse it saves when pagination or session variants
+        serve byte-identical pages.
+        """
+        digest = hashlib.blake2b(response.content, digest_size=16).digest()
+        if digest in self._seen_digests:
+            logger.info("Skipping page with duplicate content")
+            return None
+        self._seen_digests.add(digest)
+        return response.text
+
+    def _page_cache_paths(self, url):
+        """Return the (body, metadata) cache file paths for a URL
+
+        Args:
+            url (str): Page URL
+
+        Returns:
+            tuple: (body_path, meta_path)
+        """
+        digest = hashlib.blake2b(url.encode(), digest_size=8).hexdigest()
+        base = os.path.join(self._page_cache_dir, digest)
+        return base + '.html', base + '.meta'
+
+    def _cached_page_headers(self, url):
+        """Build conditional request headers from a URL's cached copy
+
+        Args:
+            url (str): Page URL
+
+        Returns:
+            dict: If-None-Match/If-Modified-Since headers, empty if uncached
+        """
+        body_path, meta_path = self._page_cache_paths(url)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not os.path.exists(body_path):
+            return {}
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def _read_cached_page(self, url):
+        """Read a page body from the on-disk cache after a 304 response
+
+        Args:
+            url (str): Page URL
+
+        Returns:
+            str or None: Cached HTML; '' if the body was already processed
+                this run; None if the cache file is unreadable
+        """
+        body_path, _ = self._page_cache_paths(url)
+        try:
+            with open(body_path, 'rb') as f:
+                body = f.read()
+        except OSError:
+            return None
+        # Run cached bodies through the same duplicate check as live ones
+        digest = hashlib.blake2b(body, digest_size=16).digest()
+        if digest in self._seen_digests:
+            logger.info("Skipping page with duplicate content")
+            return ''
+        self._seen_digests.add(digest)
+        return body.decode('utf-8', errors='replace')
+
+    def _store_cached_page(self, url, response):
+        """Cache a page body when the server provided revalidation headers
+
+        Only pages with an ETag or Last-Modified are stored - without a
+        validator a conditional request can never produce a 304.
+
+        Args:
+            url (str): Page URL
+            response (Response): Successful response to cache
+        """
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not (etag or last_modified):
+            return
+        body_path, meta_path = self._page_cache_paths(url)
+        try:
+            with open(body_path, 'wb') as f:
+                f.write(response.content)
+            with open(meta_path, 'w') as f:
+                json.dump({'url': url, 'etag': etag, 'last_modified': last_modified}, f)
+        except OSError as e:
+            logger.debug(f"Could not cache page for {url}: {e}")
+
+    def _open_logs(self):
+        """(Re)open buffered append handles for the discovery logs"""
+        self._visited_log = open(self._visited_log_path, 'a', buffering=1 << 16)
+        self._images_log = open(self._images_log_path, 'a', buffering=1 << 16)
+
+    def _load_log(self, path):
+        """Read a discovery log back into a set of URLs
+
+        Args:
+            path (str): Log file path
+
+        Returns:
+            set: URLs recorded by a previous run, empty if no log exists
+        """
+        try:
+            with open(path) as f:
+                return {line.strip() for line in f if line.strip()}
+        except OSError:
+            return set()
+
+    def _image_conditional_headers(self, url):
+        """Build conditional request headers for an already-downloaded image
+
+        Args:
+            url (str): Image URL
+
+        Returns:
+            tuple: (headers dict, saved path or None) - headers are empty
+                unless the manifest has the file with a validator and it is
+                still on disk
+        """
+        with self._manifest_lock:
+            entry = self._manifest.get(url)
+        if not entry or not os.path.exists(entry.get('path', '')):
+            return {}, None
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers, entry['path']
+
+    def _record_download(self, url, save_path, headers):
+        """Record a completed download in the manifest
+
+        Args:
+            url (str): Image URL
+            save_path (str): Path the image was saved to
+            headers: Response headers (requests or aiohttp)
+        """
+        with self._manifest_lock:
+            self._manifest[url] = {
+                'path': save_path,
+                'etag': headers.get('ETag'),
+                'last_modified': headers.get('Last-Modified'),
+            }
+
+    def _save_manifest(self):
+        """Write the download manifest to disk in one buffered pass"""
+        if not self._manifest:
+            return
+        try:
+            with self._manifest_lock:
+                with open(self._manifest_path, 'w') as f:
+                    json.dump(self._manifest, f)
+        except OSError as e:
+            logger.debug(f"Could not save download manifest: {e}")
+
     def _is_likely_image_url(self, url):
         """Check if a URL is likely to point to an image file
-        
+
         Args:
             url (str): URL to check
-            
+
         Returns:
             bool: True if URL likely points to an image, False otherwise
         """
-        # Check for common image file extensions
-        parsed_url = urllib.parse.urlparse(url)
-        path = parsed_url.path.lower()
-        
-        # Skip obvious non-image URLs
-        if any(path.endswith(ext) for ext in [
-            '.js', '.css', '.woff', '.woff2', '.ttf', '.eot', '.svg', 
-            '.html', '.htm', '.php', '.pdf', '.xml', '.json'
-        ]):
-            return False
-            
-        # Check for common image extensions
-        if any(path.endswith(ext) for ext in [
-            '.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp', '.tiff', '.ico'
-        ]):
-            return True
-            
-        # Check for common image path patterns
-        if any(pattern in path for pattern in ['/images/', '/img/', '/photos/', '/thumbnails/', 'image_', 'picture']):
-            return True
-            
-        # Check for image-serving domains
-        image_domains = ['img.', 'image.', 'images.', 'assets.', 'static.', 'cdn.', 'media.']
-        if any(domain in parsed_url.netloc for domain in image_domains):
-            return True
-        
-        # Check for contentstack.io domains (specific to Smith & Wesson site)
-        if 'contentstack.io' in parsed_url.netloc and any(ext in path for ext in ['jpg', 'jpeg', 'png', 'gif']):
-            return True
-            
-        return False
-        
+        return _likely_image_url(url)
+
+    def _maybe_add(self, out, raw, base_url):
+        """Resolve a raw candidate and add it if it passes the filters
+
+        Fuses the likely-image and format checks into insertion time, so
+        extraction doesn't build a large candidate set only to re-walk it
+        in separate filter passes.
+
+        Args:
+            out (set): Candidate set to add to
+            raw (str): Raw attribute value (possibly relative)
+            base_url (str): Base URL for resolving relative URLs
+        """
+        # Most modern sites use absolute CDN URLs; skip urljoin (pure Python
+        # and surprisingly expensive) when the candidate is already absolute
+        if raw.startswith(('http://', 'https://')):
+            url = raw
+        else:
+            url = urljoin(base_url, raw)
+        if not _likely_image_url(url):
+            return
+        if self.formats and self._get_extension_from_url(url) not in self.formats:
+            return
+        out.add(url)
+
+
     def _extract_javascript_images(self, html_content, base_url):
         """Extract image URLs from JavaScript content
         
@@ -331,161 +794,252 @@ class WebsiteImageCrawler:
             set: Set of absolute image URLs
         """
         image_urls = set()
-        
-        # Pattern for contentstack.io images (specific to Smith & Wesson site)
-        pattern1 = r'"(https?://images\.contentstack\.io/v3/assets/[^"]*\.(?:jpg|jpeg|png|gif))"'
-        
-        # General pattern for image URLs in JavaScript strings
-        pattern2 = r'"(https?://[^"]*\.(?:jpg|jpeg|png|gif))"'
-        
-        # Try to find contentstack.io URLs
-        try:
-            matches = re.findall(pattern1, html_content)
-            for url in matches:
-                if self._is_likely_image_url(url):
-                    image_urls.add(url)
-        except Exception as e:
-            logger.warning(f"Error extracting contentstack URLs: {e}")
-            
-        # Try to find general image URLs
+
+        # Embedded JSON state (__NEXT_DATA__, ld+json and friends) is parsed
+        # properly and walked - faster and more accurate than backtracking
+        # regexes over megabytes of minified blob
+        for match in _JSON_SCRIPT_RE.finditer(html_content):
+            try:
+                data = _json.loads(match.group(1))
+            except Exception:
+                continue
+            self._walk_json_images(data, base_url, image_urls)
+
+        # One precompiled scan of the HTML for plain inline scripts - the
+        # old contentstack-specific pattern matched a subset of the general
+        # one, so a single pass covers both
         try:
-            matches = re.findall(pattern2, html_content)
-            for url in matches:
-                if self._is_likely_image_url(url):
-                    image_urls.add(url)
+            for url in _JS_IMG_RE.findall(html_content):
+                self._maybe_add(image_urls, url, base_url)
         except Exception as e:
-            logger.warning(f"Error extracting general image URLs: {e}")
-            
+            logger.warning(f"Error extracting image URLs from JavaScript: {e}")
+
         return image_urls
 
-    def _extract_images(self, html_content, base_url):
-        """Extract image URLs from HTML content
-        
+    def _walk_json_images(self, node, base_url, image_urls):
+        """Recursively collect image URLs from a parsed JSON structure
+
+        Args:
+            node: Current value (dict, list, str or scalar)
+            base_url (str): Base URL for resolving relative URLs
+            image_urls (set): Candidate set to add to
+        """
+        if isinstance(node, str):
+            if node.startswith(('http://', 'https://')) and node.lower().endswith(_IMAGE_EXTS):
+                self._maybe_add(image_urls, node, base_url)
+        elif isinstance(node, dict):
+            for value in node.values():
+                self._walk_json_images(value, base_url, image_urls)
+        elif isinstance(node, list):
+            for item in node:
+                self._walk_json_images(item, base_url, image_urls)
+
+    def _parse_page(self, html_content):
+        """Parse a page's HTML into a tree shared by image and link extraction
+
         Args:
             html_content (str): HTML content
+
+        Returns:
+            LexborHTMLParser, BeautifulSoup or None: Parsed tree, or None
+                for empty content
+        """
+        if not html_content:
+            return None
+        if HAS_SELECTOLAX:
+            return LexborHTMLParser(html_content)
+        return BeautifulSoup(html_content, _BS4_PARSER, parse_only=_PARSE_TAGS)
+
+    def _extract_images(self, tree, html_content, base_url):
+        """Extract image URLs from a parsed page
+
+        Args:
+            tree: Parsed page tree from _parse_page
+            html_content (str): Raw HTML, scanned for JavaScript-embedded URLs
             base_url (str): Base URL for resolving relative URLs
-            
+
         Returns:
             set: Set of absolute image URLs
         """
-        if not html_content:
+        if tree is None:
             return set()
-            
-        soup = BeautifulSoup(html_content, 'html.parser')
-        image_urls = set()
+
+        if HAS_SELECTOLAX:
+            image_urls = self._dom_images_lexbor(tree, base_url)
+        else:
+            image_urls = self._dom_images_bs4(tree, base_url)
+
+        # Extract from inline styles - style= attributes can appear on any
+        # element, which the strained parse no longer covers, so scan the
+        # raw HTML instead
+        for style_match in _STYLE_ATTR_RE.finditer(html_content):
+            for url in _CSS_URL_RE.findall(style_match.group(2)):
+                self._maybe_add(image_urls, url, base_url)
         
-        # Extract from img tags - both src and data- attributes used for lazy loading
-        for img in soup.find_all('img'):
-            # Regular src attribute
-            src = img.get('src')
+        # Extract images from JavaScript/JSON data in script tags
+        js_images = self._extract_javascript_images(html_content, base_url)
+        image_urls.update(js_images)
+        logger.debug("Found %d images in JavaScript/JSON data", len(js_images))
+
+        # Candidates were filtered by _maybe_add at insertion time, so no
+        # post-hoc likely-image or format passes are needed
+        return image_urls
+
+    def _dom_images_lexbor(self, tree, base_url):
+        """Collect image URLs from the DOM using selectolax/Lexbor
+
+        Args:
+            tree (LexborHTMLParser): Parsed page tree
+            base_url (str): Base URL for resolving relative URLs
+
+        Returns:
+            set: Set of absolute image URLs
+        """
+        image_urls = set()
+
+        # img tags - both src and data- attributes used for lazy loading
+        for img in tree.css('img'):
+            attrs = img.attributes
+            src = attrs.get('src')
             if src:
-                abs_url = urljoin(base_url, src)
-                image_urls.add(abs_url)
-            
-            # Check for lazy loading attributes
-            for attr in ['data-src', 'data-original', 'data-lazy-src', 'data-srcset', 'lazy-src']:
-                lazy_src = img.get(attr)
+                self._maybe_add(image_urls, src, base_url)
+
+            for attr in _LAZY_ATTRS:
+                lazy_src = attrs.get(attr)
                 if lazy_src:
-                    abs_url = urljoin(base_url, lazy_src)
-                    image_urls.add(abs_url)
-            
-            # Handle srcset attribute (responsive images)
-            srcset = img.get('srcset')
+                    self._maybe_add(image_urls, lazy_src, base_url)
+
+            srcset = attrs.get('srcset')
             if srcset:
-                # Parse srcset format: "url1 1x, url2 2x" or "url1 100w, url2 200w"
-                for src_item in srcset.split(','):
-                    src_parts = src_item.strip().split(' ')
-                    if src_parts and src_parts[0]:
-                        abs_url = urljoin(base_url, src_parts[0])
-                        image_urls.add(abs_url)
-        
-        # Extract from picture > source tags (modern responsive images)
-        for picture in soup.find_all('picture'):
-            for source in picture.find_all('source'):
-                # Handle srcset
-                srcset = source.get('srcset')
+                self._add_srcset(srcset, base_url, image_urls)
+
+        # picture > source tags (modern responsive images)
+        for source in tree.css('picture source'):
+            srcset = source.attributes.get('srcset')
+            if srcset:
+                self._add_srcset(srcset, base_url, image_urls)
+
+        # CSS background images in style tags (simplified)
+        for style in tree.css('style'):
+            css = style.text()
+            if css:
+                for url in _CSS_URL_RE.findall(css):
+                    self._maybe_add(image_urls, url, base_url)
+
+        # OpenGraph image meta tags
+        for meta in tree.css('meta[property="og:image"], meta[property="twitter:image"]'):
+            content = meta.attributes.get('content')
+            if content:
+                self._maybe_add(image_urls, content, base_url)
+
+        return image_urls
+
+    def _dom_images_bs4(self, soup, base_url):
+        """Collect image URLs from the DOM using BeautifulSoup
+
+        Args:
+            soup (BeautifulSoup): Parsed page tree
+            base_url (str): Base URL for resolving relative URLs
+
+        Returns:
+            set: Set of absolute image URLs
+        """
+        image_urls = set()
+
+        # One walk over the tree instead of a find_all scan per tag type -
+        # each find_all visits every node, so four scans cost four
+        # traversals for the same information
+        for el in soup.descendants:
+            if not isinstance(el, Tag):
+                continue
+            name = el.name
+
+            if name == 'img':
+                # Both src and data- attributes used for lazy loading
+                src = el.get('src')
+                if src:
+                    self._maybe_add(image_urls, src, base_url)
+
+                for attr in _LAZY_ATTRS:
+                    lazy_src = el.get(attr)
+                    if lazy_src:
+                        self._maybe_add(image_urls, lazy_src, base_url)
+
+                # Handle srcset attribute (responsive images)
+                srcset = el.get('srcset')
                 if srcset:
-                    for src_item in srcset.split(','):
-                        src_parts = src_item.strip().split(' ')
-                        if src_parts and src_parts[0]:
-                            abs_url = urljoin(base_url, src_parts[0])
-                            image_urls.add(abs_url)
-        
-        # Extract from CSS background images (simplified)
-        style_tags = soup.find_all('style')
-        for style in style_tags:
-            if style.string:
-                # Find URLs in CSS
-                css_urls = re.findall(r'url\([\'"]?([^\'"()]+)[\'"]?\)', style.string)
-                for url in css_urls:
-                    abs_url = urljoin(base_url, url)
-                    image_urls.add(abs_url)
-        
-        # Extract from inline styles
-        elements_with_style = soup.find_all(attrs={"style": True})
-        for element in elements_with_style:
-            if element.get('style'):
-                # Find URLs in inline styles
-                inline_urls = re.findall(r'url\([\'"]?([^\'"()]+)[\'"]?\)', element['style'])
-                for url in inline_urls:
-                    abs_url = urljoin(base_url, url)
-                    image_urls.add(abs_url)
-        
-        # Extract OpenGraph image meta tags
-        for meta in soup.find_all('meta'):
-            if meta.get('property') in ['og:image', 'twitter:image']:
-                content = meta.get('content')
-                if content:
-                    abs_url = urljoin(base_url, content)
-                    image_urls.add(abs_url)
-        
-        # Extract images from JavaScript/JSON data in script tags
-        js_images = self._extract_javascript_images(html_content, base_url)
-        image_urls.update(js_images)
-        logger.debug(f"Found {len(js_images)} images in JavaScript/JSON data")
-        
-        # Pre-filter URLs that are likely to be images
-        pre_filtered_urls = {url for url in image_urls if self._is_likely_image_url(url)}
-        
-        # Filter by format if specified
-        if self.formats:
-            filtered_urls = set()
-            for url in pre_filtered_urls:
-                ext = self._get_extension_from_url(url)
-                if ext in self.formats:
-                    filtered_urls.add(url)
-            return filtered_urls
-        
-        return pre_filtered_urls
-    
-    def _extract_links(self, html_content, base_url):
-        """Extract links from HTML content, ensuring they are from the same domain
-        
+                    self._add_srcset(srcset, base_url, image_urls)
+
+            elif name == 'source':
+                # picture > source tags (modern responsive images)
+                if el.parent is not None and el.parent.name == 'picture':
+                    srcset = el.get('srcset')
+                    if srcset:
+                        self._add_srcset(srcset, base_url, image_urls)
+
+            elif name == 'style':
+                # CSS background images (simplified)
+                if el.string:
+                    for url in _CSS_URL_RE.findall(el.string):
+                        self._maybe_add(image_urls, url, base_url)
+
+            elif name == 'meta':
+                # OpenGraph image meta tags
+                if el.get('property') in ['og:image', 'twitter:image']:
+                    content = el.get('content')
+                    if content:
+                        self._maybe_add(image_urls, content, base_url)
+
+        return image_urls
+
+    def _add_srcset(self, srcset, base_url, image_urls):
+        """Add every URL in a srcset attribute to the candidate set
+
         Args:
-            html_content (str): HTML content
+            srcset (str): srcset value, e.g. "url1 1x, url2 2x"
             base_url (str): Base URL for resolving relative URLs
-            
+            image_urls (set): Candidate set to add to
+        """
+        for match in _SRCSET_URL_RE.finditer(srcset):
+            self._maybe_add(image_urls, match.group(1), base_url)
+
+    def _extract_links(self, tree, base_url):
+        """Extract same-domain links from a parsed page
+
+        Args:
+            tree: Parsed page tree from _parse_page
+            base_url (str): Base URL for resolving relative URLs
+
         Returns:
             list: List of absolute URLs
         """
-        if not html_content:
+        if tree is None:
             return []
-            
-        soup = BeautifulSoup(html_content, 'html.parser')
-        base_domain = urlparse(base_url).netloc
+
+        base_domain = _netloc(base_url)
         links = []
-        
-        for anchor in soup.find_all('a', href=True):
-            href = anchor['href']
-            abs_url = urljoin(base_url, href)
-            
+
+        if HAS_SELECTOLAX:
+            hrefs = [a.attributes.get('href') for a in tree.css('a[href]')]
+        else:
+            hrefs = [a['href'] for a in tree.find_all('a', href=True)]
+
+        for href in hrefs:
+            if not href:
+                continue
+            # Same-domain links are often relative, but skip the urljoin
+            # reparse for the absolute ones
+            if href.startswith(('http://', 'https://')):
+                abs_url = href
+            else:
+                abs_url = urljoin(base_url, href)
+
             # Skip fragment identifiers and non-HTTP links
             if abs_url.startswith(('http://', 'https://')):
                 # Only include links from the same domain
-                link_domain = urlparse(abs_url).netloc
-                if link_domain == base_domain:
+                if _netloc(abs_url) == base_domain:
                     links.append(abs_url)
-        
+
         return links
     
     def download_images(self, urls, formats=None):
@@ -501,63 +1055,191 @@ class WebsiteImageCrawler:
         if not urls:
             logger.warning("No image URLs to download")
             return []
-        
-        # If we only have a few URLs, don't use batching
-        if len(urls) <= 5:
-            logger.info(f"Downloading {len(urls)} images...")
-            downloaded = []
-            for url in urls:
-                try:
-                    result = self.download_image(url, formats)
-                    if result:
-                        downloaded.append(result)
-                except Exception as e:
-                    logger.error(f"Error downloading {url}: {e}")
-            return downloaded
-            
-        # Process in batches to avoid overwhelming the server
-        batch_size = min(10, len(urls))
+
+        # Run the whole set on the shared event loop when aiohttp is
+        # available: one connection pool, no thread churn, per-host limits
+        # built in, and connections kept alive between pages
+        if self.use_async:
+            loop = self._ensure_async_loop()
+            future = asyncio.run_coroutine_threadsafe(
+                self._download_images_async(urls, formats), loop)
+            return future.result()
+
+        # Threaded fallback: submit everything to the long-lived pool and
+        # collect results as they finish - no per-batch executor churn, and
+        # a slow download never blocks bookkeeping for completed ones
+        logger.info(f"Downloading {len(urls)} images...")
         downloaded = []
-        
-        for i in range(0, len(urls), batch_size):
-            batch = urls[i:i + batch_size]
-            logger.info(f"Processing batch {i//batch_size + 1}/{(len(urls)-1)//batch_size + 1} (images {i+1}-{min(i+batch_size, len(urls))})")
-            
-            # Use ThreadPoolExecutor for concurrent downloads
-            successful_in_batch = 0
-            with ThreadPoolExecutor(max_workers=5) as executor:
-                future_to_url = {executor.submit(self.download_image, url, formats): url for url in batch}
-                for future in future_to_url:
-                    try:
-                        result = future.result(timeout=30)  # Add timeout to prevent hanging
-                        if result:
-                            downloaded.append(result)
-                            successful_in_batch += 1
-                    except Exception as e:
-                        url = future_to_url[future]
-                        logger.error(f"Error downloading {url}: {e}")
-            
-            # Show progress 
-            logger.info(f"Batch {i//batch_size + 1} complete: Downloaded {successful_in_batch}/{len(batch)} images")
-                
-            # Pause between batches if needed
-            if i + batch_size < len(urls):
-                # Dynamic delay based on success rate to avoid rate limiting
-                success_rate = successful_in_batch / len(batch)
-                if success_rate < 0.3:  # If less than 30% success, increase delay
-                    pause = min(3.0, self.delay * 2)  # Cap at 3 seconds
-                    logger.warning(f"Low success rate ({success_rate:.1%}). Increasing delay to {pause}s")
-                    time.sleep(pause)
-                else:
-                    time.sleep(self.delay)  # Normal delay
-                
+        future_to_url = {self._download_pool.submit(self.download_image, url, formats): url
+                         for url in urls}
+        for future in as_completed(future_to_url):
+            url = future_to_url[future]
+            try:
+                result = future.result(timeout=60)  # Add timeout to prevent hanging
+                if result:
+                    downloaded.append(result)
+            except Exception as e:
+                logger.error(f"Error downloading {url}: {e}")
+
         if downloaded:
             logger.info(f"Successfully downloaded {len(downloaded)}/{len(urls)} images")
         else:
             logger.warning("Failed to download any images")
                 
         return downloaded
-    
+
+    def _ensure_async_loop(self):
+        """Start the background download event loop on first use
+
+        Returns:
+            asyncio.AbstractEventLoop: The running loop
+        """
+        if self._async_loop is None:
+            self._async_loop = asyncio.new_event_loop()
+            threading.Thread(target=self._async_loop.run_forever,
+                             name='crawler-downloads', daemon=True).start()
+        return self._async_loop
+
+    async def _get_aio_session(self):
+        """Return the shared aiohttp session, creating it on first use
+
+        Returns:
+            aiohttp.ClientSession: Session bound to the background loop
+        """
+        if self._aio_session is None:
+            connector = aiohttp.TCPConnector(limit=64, limit_per_host=8, ttl_dns_cache=300)
+            timeout = aiohttp.ClientTimeout(total=60, sock_connect=15)
+            self._aio_session = aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                                      headers=dict(self.session.headers))
+        return self._aio_session
+
+    def close(self):
+        """Flush logs and the manifest, release the background event loop"""
+        self._save_manifest()
+        for log in (self._visited_log, self._images_log):
+            if log is not None and not log.closed:
+                log.close()
+        if self._async_loop is not None:
+            if self._aio_session is not None:
+                asyncio.run_coroutine_threadsafe(
+                    self._aio_session.close(), self._async_loop).result()
+                self._aio_session = None
+            self._async_loop.call_soon_threadsafe(self._async_loop.stop)
+            self._async_loop = None
+
+    async def _download_images_async(self, urls, formats=None):
+        """Download images concurrently on a single asyncio event loop
+
+        Args:
+            urls (list): List of image URLs to download
+            formats (list): List of formats to filter by
+
+        Returns:
+            list: Paths to downloaded images
+        """
+        logger.info(f"Downloading {len(urls)} images (async)...")
+        session = await self._get_aio_session()
+        # Async tasks are cheaper than threads, so allow twice the thread
+        # worker count before queueing
+        semaphore = asyncio.Semaphore(self.workers * 2)
+
+        tasks = [self._download_image_async(session, semaphore, url, formats) for url in urls]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        downloaded = []
+        for url, result in zip(urls, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error downloading {url}: {result}")
+            elif result:
+                downloaded.append(result)
+
+        if downloaded:
+            logger.info(f"Successfully downloaded {len(downloaded)}/{len(urls)} images")
+        else:
+            logger.warning("Failed to download any images")
+
+        return downloaded
+
+    async def _download_image_async(self, session, semaphore, url, formats=None):
+        """Download a single image using an aiohttp session
+
+        Args:
+            session: Shared aiohttp.ClientSession
+            semaphore: asyncio.Semaphore bounding concurrent downloads
+            url (str): URL of image to download
+            formats (list): List of formats to filter by
+
+        Returns:
+            str or None: Path to downloaded image or None if download failed
+        """
+        retries = 2  # Number of retries for each download
+
+        for attempt in range(retries + 1):
+            try:
+                async with semaphore:
+                    conditional, cached_path = self._image_conditional_headers(url)
+                    async with session.get(url, headers={'Accept-Encoding': 'identity',
+                                                         **conditional}) as response:
+                        if response.status == 304:
+                            logger.debug("Not modified - keeping existing file for %s", url)
+                            return cached_path
+                        response.raise_for_status()
+                        content_type = response.headers.get('Content-Type', '').lower()
+
+                        # Check if this is actually an image
+                        if not content_type.startswith('image/'):
+                            logger.info("Skipping non-image content: %s from %s", content_type, url)
+                            return None
+
+                        # Check if format matches requested formats
+                        if formats and not self._format_allowed(url, content_type, formats):
+                            return None
+
+                        # Abort oversized downloads before reading any of the body
+                        content_length = response.headers.get('Content-Length')
+                        if content_length and int(content_length) > _MAX_IMAGE_BYTES:
+                            logger.info("Skipping oversized image (%s bytes): %s", content_length, url)
+                            return None
+
+                        filename, save_path, already_saved = self._resolve_save_path(url, response, content_type, formats)
+                        if already_saved:
+                            logger.debug("Already saved: %s - skipping download", filename)
+                            return save_path
+
+                        # Download the image in chunks to handle large files
+                        # 256KB chunks: far fewer loop iterations than 8KB
+                        # without holding whole images in memory per task
+                        # f.tell() already knows the byte count - no point
+                        # paying a second stat() on the file we just wrote
+                        try:
+                            with open(save_path, 'wb') as f:
+                                self._preallocate(f, content_length)
+                                async for chunk in response.content.iter_chunked(_DOWNLOAD_CHUNK // 4):
+                                    f.write(chunk)
+                                size_kb = f.tell() / 1024
+                        except Exception:
+                            self._discard_partial(save_path)
+                            raise
+
+                        self._record_download(url, save_path, response.headers)
+
+                logger.info("Downloaded: %s (%s) - %.1f KB", filename, content_type, size_kb)
+                return save_path
+
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                # Non-transient HTTP errors (404s and friends) will fail the
+                # same way every time - don't burn retries on them
+                if isinstance(e, aiohttp.ClientResponseError) and not _is_transient_status(e.status):
+                    logger.error(f"Failed to download {url}: {e}")
+                    return None
+                if attempt < retries:
+                    backoff = _retry_backoff(attempt)
+                    logger.warning("Error downloading %s: %s. Retrying in %.1fs (attempt %d/%d)", url, e, backoff, attempt + 1, retries)
+                    await asyncio.sleep(backoff)
+                else:
+                    logger.error(f"Failed to download {url} after {retries} attempts")
+                    return None
+
     def download_image(self, url, formats=None):
         """Download a single image and save it to disk
         
@@ -572,105 +1254,213 @@ class WebsiteImageCrawler:
         
         for attempt in range(retries + 1):
             try:
-                # First perform a HEAD request to check content type
-                try:
-                    head_response = self.session.head(url, timeout=5)
-                    content_type = head_response.headers.get('Content-Type', '').lower()
-                except Exception:
-                    # If HEAD fails, fallback to GET but only fetch headers
-                    head_response = self.session.get(url, timeout=5, stream=True)
-                    content_type = head_response.headers.get('Content-Type', '').lower()
-                    head_response.close()  # Important: close the connection
-                
+                # A single streaming GET: the headers arrive before the body,
+                # so Content-Type can be checked and the response closed
+                # without paying for a separate HEAD round-trip per image
+                # Image bodies are already compressed; identity stops servers
+                # from wasting CPU recompressing them and keeps urllib3 from
+                # buffering a wrapped body
+                # (connect, read) timeout tuple fails fast on dead hosts
+                # without cutting slow-but-alive transfers short
+                conditional, cached_path = self._image_conditional_headers(url)
+                response = self.session.get(url, timeout=(5, 15), stream=True,
+                                            allow_redirects=True,
+                                            headers={'Accept-Encoding': 'identity',
+                                                     **conditional})
+                if response.status_code == 304:
+                    logger.debug("Not modified - keeping existing file for %s", url)
+                    response.close()
+                    return cached_path
+                response.raise_for_status()
+                content_type = response.headers.get('Content-Type', '').lower()
+
                 # Check if this is actually an image
                 if not content_type.startswith('image/'):
-                    logger.info(f"Skipping non-image content: {content_type} from {url}")
+                    logger.info("Skipping non-image content: %s from %s", content_type, url)
+                    response.close()
                     return None
                     
                 # Check if format matches requested formats
-                if formats:
-                    # Check URL extension first (for sites using content negotiation)
-                    url_ext = self._get_extension_from_url(url).lower()
-                    url_format_matched = url_ext in formats
-                    
-                    # Then check content type
-                    content_format_matched = False
-                    for fmt in formats:
-                        if fmt.lower() in ['jpg', 'jpeg'] and 'jpeg' in content_type:
-                            content_format_matched = True
-                            break
-                        elif fmt.lower() in content_type:
-                            content_format_matched = True
-                            break
-                    
-                    # Accept if either URL extension or content-type matches the requested formats
-                    # This handles sites like BigCommerce that serve WebP despite .png/.jpg URL extensions
-                    if not (url_format_matched or content_format_matched):
-                        logger.info(f"Skipping image: URL ext={url_ext}, content-type={content_type} - not in requested formats {formats}")
-                        return None
-                
-                # Get the image content
-                response = self.session.get(url, timeout=15, stream=True)
-                response.raise_for_status()
-                
-                # Determine the correct file extension based on Content-Type
-                content_type = response.headers.get('Content-Type', '').lower()
-                content_type_extension = self._get_extension_from_content_type(content_type)
-                url_extension = self._get_extension_from_url(url)
-                
-                # If user requested specific formats and the URL has one of those extensions,
-                # use the URL extension instead of the content-type extension
-                # This handles cases where servers use content negotiation (e.g., returning WebP for PNG URLs)
-                if formats and url_extension in formats:
-                    extension = url_extension
-                    if content_type_extension and content_type_extension != url_extension:
-                        logger.warning(f"Format mismatch: URL suggests {extension} but server returned {content_type}. "
-                                       f"File will be saved with .{extension} extension but contains {content_type} data.")
-                    logger.debug(f"Format override: Using URL extension {extension} instead of content-type extension {content_type_extension}")
-                elif content_type_extension:
-                    extension = content_type_extension
-                else:
-                    extension = url_extension
-                
-                # Get the filename from response or URL
-                filename = self._get_filename(url, response)
-                
-                # Make sure the extension is correct by replacing it
-                if extension:
-                    base_name = os.path.splitext(filename)[0]
-                    filename = f"{base_name}.{extension}"
-                
-                # Sanitize filename to remove problematic characters
-                filename = self._sanitize_filename(filename)
-                
-                # Save the image
-                save_path = os.path.join(self.save_dir, filename)
-                
-                # Handle duplicate filenames
-                counter = 1
-                original_base_name, ext = os.path.splitext(filename)
-                while os.path.exists(save_path):
-                    new_filename = f"{original_base_name}_{counter}{ext}"
-                    save_path = os.path.join(self.save_dir, new_filename)
-                    counter += 1
-                
-                # Download the image in chunks to handle large files
-                with open(save_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
-                
-                size_kb = os.path.getsize(save_path) / 1024
-                logger.info(f"Downloaded: {filename} ({content_type}) - {size_kb:.1f} KB")
+                if formats and not self._format_allowed(url, content_type, formats):
+                    response.close()
+                    return None
+
+                # Abort oversized downloads before reading any of the body
+                content_length = response.headers.get('Content-Length')
+                if content_length and int(content_length) > _MAX_IMAGE_BYTES:
+                    logger.info("Skipping oversized image (%s bytes): %s", content_length, url)
+                    response.close()
+                    return None
+
+                filename, save_path, already_saved = self._resolve_save_path(url, response, content_type, formats)
+                if already_saved:
+                    logger.debug("Already saved: %s - skipping download", filename)
+                    response.close()
+                    return save_path
+
+                # Copy the body straight from the socket with 1MB buffers -
+                # copyfileobj runs the read/write loop in C instead of one
+                # Python f.write call per 8KB chunk
+                response.raw.decode_content = True
+                # f.tell() already knows the byte count - no point paying a
+                # second stat() on the file we just wrote
+                try:
+                    with open(save_path, 'wb') as f:
+                        self._preallocate(f, content_length)
+                        shutil.copyfileobj(response.raw, f, length=_DOWNLOAD_CHUNK)
+                        size_kb = f.tell() / 1024
+                except Exception:
+                    self._discard_partial(save_path)
+                    raise
+
+                self._record_download(url, save_path, response.headers)
+                logger.info("Downloaded: %s (%s) - %.1f KB", filename, content_type, size_kb)
                 return save_path
                 
             except Exception as e:
-                logger.warning(f"Error downloading {url}: {e}. Retrying in {2**attempt}s (attempt {attempt+1}/{retries})")
+                # Non-transient HTTP errors (404s and friends) will fail the
+                # same way every time - don't burn retries on them
+                if (isinstance(e, requests.exceptions.HTTPError) and e.response is not None
+                        and not _is_transient_status(e.response.status_code)):
+                    logger.error(f"Failed to download {url}: {e}")
+                    return None
                 if attempt < retries:
-                    time.sleep(2 ** attempt)
+                    backoff = _retry_backoff(attempt)
+                    logger.warning("Error downloading %s: %s. Retrying in %.1fs (attempt %d/%d)", url, e, backoff, attempt + 1, retries)
+                    time.sleep(backoff)
                 else:
                     logger.error(f"Failed to download {url} after {retries} attempts")
                     return None
     
+    def _preallocate(self, f, content_length):
+        """Reserve the final file size up-front when the server declared it
+
+        Telling the kernel the size before writing avoids incremental
+        extent allocation and fragmentation on large images.
+
+        Args:
+            f: Open binary file object being written
+            content_length (str or None): Content-Length header value
+        """
+        if not content_length or not hasattr(os, 'posix_fallocate'):
+            return
+        try:
+            os.posix_fallocate(f.fileno(), 0, int(content_length))
+        except OSError:
+            # tmpfs and some network filesystems don't support it
+            pass
+
+    def _discard_partial(self, save_path):
+        """Remove a download that failed partway through its body
+
+        The preallocation pads the file to Content-Length before any bytes
+        arrive, so a half-written file left behind would later match the
+        size-equality dedupe in _resolve_save_path and masquerade as a
+        completed download.
+
+        Args:
+            save_path (str): Path of the partially-written file
+        """
+        try:
+            os.remove(save_path)
+        except OSError:
+            pass
+
+    def _format_allowed(self, url, content_type, formats):
+        """Check whether a download matches the requested formats
+
+        Accepts if either the URL extension or the Content-Type matches.
+        This handles sites like BigCommerce that serve WebP despite
+        .png/.jpg URL extensions.
+
+        Args:
+            url (str): URL of the image
+            content_type (str): Content-Type header value
+            formats (list): List of formats to filter by
+
+        Returns:
+            bool: True if the download should proceed
+        """
+        # Check URL extension first (for sites using content negotiation)
+        url_ext = self._get_extension_from_url(url).lower()
+        url_format_matched = url_ext in formats
+
+        # Then check content type
+        content_format_matched = False
+        for fmt in formats:
+            if fmt.lower() in ['jpg', 'jpeg'] and 'jpeg' in content_type:
+                content_format_matched = True
+                break
+            elif fmt.lower() in content_type:
+                content_format_matched = True
+                break
+
+        if not (url_format_matched or content_format_matched):
+            logger.info(f"Skipping image: URL ext={url_ext}, content-type={content_type} - not in requested formats {formats}")
+            return False
+        return True
+
+    def _resolve_save_path(self, url, response, content_type, formats):
+        """Derive the sanitized, de-duplicated save path for a download
+
+        Args:
+            url (str): URL of the image
+            response: Response object (requests or aiohttp) for header access
+            content_type (str): Content-Type header value
+            formats (list): List of formats to filter by
+
+        Returns:
+            tuple: (filename, save_path, already_saved) - already_saved is
+                True when an identical file is on disk and the download
+                can be skipped
+        """
+        # Determine the correct file extension based on Content-Type
+        content_type_extension = self._get_extension_from_content_type(content_type)
+        url_extension = self._get_extension_from_url(url)
+
+        # If user requested specific formats and the URL has one of those extensions,
+        # use the URL extension instead of the content-type extension
+        # This handles cases where servers use content negotiation (e.g., returning WebP for PNG URLs)
+        if formats and url_extension in formats:
+            extension = url_extension
+            if content_type_extension and content_type_extension != url_extension:
+                logger.warning(f"Format mismatch: URL suggests {extension} but server returned {content_type}. "
+                               f"File will be saved with .{extension} extension but contains {content_type} data.")
+            logger.debug(f"Format override: Using URL extension {extension} instead of content-type extension {content_type_extension}")
+        elif content_type_extension:
+            extension = content_type_extension
+        else:
+            extension = url_extension
+
+        # Get the filename from response or URL
+        filename = self._get_filename(url, response)
+
+        # Make sure the extension is correct by replacing it
+        if extension:
+            base_name = os.path.splitext(filename)[0]
+            filename = f"{base_name}.{extension}"
+
+        # Sanitize filename to remove problematic characters
+        filename = self._sanitize_filename(filename)
+
+        # Save the image
+        save_path = os.path.join(self.save_dir, filename)
+
+        # Handle duplicate filenames - an existing file whose size matches
+        # Content-Length is the same image, so skip the download instead of
+        # stat-spinning through numbered suffixes
+        content_length = response.headers.get('Content-Length')
+        counter = 1
+        original_base_name, ext = os.path.splitext(filename)
+        while os.path.exists(save_path):
+            if content_length and os.path.getsize(save_path) == int(content_length):
+                return filename, save_path, True
+            filename = f"{original_base_name}_{counter}{ext}"
+            save_path = os.path.join(self.save_dir, filename)
+            counter += 1
+
+        return filename, save_path, False
+
     def _get_extension_from_content_type(self, content_type):
         """Get the file extension from Content-Type header
         
@@ -680,40 +1470,7 @@ class WebsiteImageCrawler:
         Returns:
             str: File extension without dot
         """
-        # Map MIME types to appropriate file extensions
-        content_type = content_type.lower()
-        mime_map = {
-            'image/jpeg': 'jpg',
-            'image/jpg': 'jpg',
-            'image/png': 'png',
-            'image/gif': 'gif',
-            'image/bmp': 'bmp',
-            'image/webp': 'webp',
-            'image/tiff': 'tiff',
-            'image/svg+xml': 'svg'
-        }
-        
-        # Check for exact match
-        if content_type in mime_map:
-            return mime_map[content_type]
-        
-        # Try partial match (some servers might send additional parameters)
-        for mime, ext in mime_map.items():
-            if content_type.startswith(mime):
-                return ext
-        
-        # Check for generic patterns
-        if 'jpeg' in content_type or 'jpg' in content_type:
-            return 'jpg'
-        elif 'png' in content_type:
-            return 'png'
-        elif 'gif' in content_type:
-            return 'gif'
-        elif 'webp' in content_type:
-            return 'webp'
-        
-        # Default to jpg for unknown image types
-        return 'jpg'
+        return _ext_from_mime(content_type)
     
     def _get_extension_from_url(self, url):
         """Get file extension from URL
@@ -724,16 +1481,7 @@ class WebsiteImageCrawler:
         Returns:
             str: File extension without dot
         """
-        parsed_url = urlparse(url)
-        path = parsed_url.path
-        extension = os.path.splitext(path)[1].lower().replace('.', '')
-        
-        # Check if extension is valid
-        if extension in ['jpg', 'jpeg', 'png', 'gif', 'webp', 'bmp', 'svg', 'tiff']:
-            return extension
-            
-        # Default to jpg for unknown extensions
-        return 'jpg'
+        return _ext_from_url(url)
     
     def _get_filename(self, url, response):
         """Generate a filename for the image based on URL or content disposition
@@ -749,7 +1497,7 @@ class WebsiteImageCrawler:
         content_disposition = response.headers.get('Content-Disposition')
         if content_disposition:
             # Extract filename from Content-Disposition
-            filename_match = re.search(r'filename=[\'"]?([^\'";]+)', content_disposition)
+            filename_match = _FN_RE.search(content_disposition)
             if filename_match:
                 return filename_match.group(1)
         
@@ -765,8 +1513,10 @@ class WebsiteImageCrawler:
         if filename and '.' in filename:
             return filename
             
-        # Generate a filename based on URL hash
-        url_hash = abs(hash(url)) % 10000
+        # Generate a filename from a stable URL digest - unlike hash(), which
+        # is salted per process and was folded to 10k buckets, blake2b gives
+        # the same collision-free name for the same URL on every run
+        url_hash = hashlib.blake2b(url.encode(), digest_size=6).hexdigest()
         extension = self._get_extension_from_url(url)
         return f"image_{url_hash}.{extension}"
     
@@ -779,19 +1529,8 @@ class WebsiteImageCrawler:
         Returns:
             str: Sanitized filename
         """
-        # Replace potentially problematic characters
-        invalid_chars = ['<', '>', ':', '"', '/', '\\', '|', '?', '*']
-        for char in invalid_chars:
-            filename = filename.replace(char, '_')
-            
-        # Limit filename length to avoid issues with long paths
-        if len(filename) > 150:
-            name, ext = os.path.splitext(filename)
-            filename = name[:140] + ext
-            
-        # Remove leading/trailing spaces and dots which can cause issues
-        filename = filename.strip('. ')
-        
+        filename = _sanitize_core(filename)
+
         # Ensure filename is not empty
         if not filename or filename == '.':
             timestamp = int(time.time())
@@ -810,10 +1549,10 @@ class WebsiteImageCrawler:
             str: Path to saved file
         """
         file_path = os.path.join(self.save_dir, filename)
+        # One join and one write instead of a Python-level write per URL
         with open(file_path, 'w') as f:
-            for url in sorted(self.visited_urls):
-                f.write(f"{url}\n")
-        
+            f.write('\n'.join(sorted(self.visited_urls)) + '\n')
+
         logger.info(f"Saved {len(self.visited_urls)} URLs to {file_path}")
         return file_path
         
@@ -827,10 +1566,10 @@ class WebsiteImageCrawler:
             str: Path to saved file
         """
         file_path = os.path.join(self.save_dir, filename)
+        # One join and one write instead of a Python-level write per URL
         with open(file_path, 'w') as f:
-            for url in sorted(self.image_urls):
-                f.write(f"{url}\n")
-        
+            f.write('\n'.join(sorted(self.image_urls)) + '\n')
+
         logger.info(f"Saved {len(self.image_urls)} image URLs to {file_path}")
         return file_path
 
@@ -876,7 +1615,26 @@ def main():
     )
     
     parser.add_argument(
-        "--save-urls", "-s", 
+        "--workers", "-w",
+        type=int,
+        default=10,
+        help="Number of concurrent image downloads (default: 10)"
+    )
+
+    parser.add_argument(
+        "--no-async",
+        action="store_true",
+        help="Download with the thread pool instead of the aiohttp event loop"
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip pages and images already recorded by a previous run in the output directory"
+    )
+
+    parser.add_argument(
+        "--save-urls", "-s",
         action="store_true", 
         help="Save the list of crawled URLs to a file"
     )
@@ -899,7 +1657,10 @@ def main():
         max_images=args.max,
         formats=args.formats,
         delay=args.delay,
-        verbose=args.verbose
+        verbose=args.verbose,
+        workers=args.workers,
+        use_async=not args.no_async,
+        resume=args.resume
     )
     
     # Start crawling